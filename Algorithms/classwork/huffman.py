@@ -11,29 +11,28 @@ While forest has more than one node:
     remove the two nodes w/ lowest freq
     combine them as children of a new node whose value is their total freq
 '''
+from collections import Counter
+
+import numpy as np
+
 msg = "HELLO WORLD"
 
 def get_freq_dict(msg):
-    freq = {}
-    for l in msg:
-        if l in freq:
-            freq[l] += 1
-        else:
-            freq[l] = 1
-    return freq
+    # Counter counts in C and keeps the order of first appearance
+    return dict(Counter(msg))
 
 def get_freq(msg):
     space = ord(' ')
     tilde = ord('~')
-    from_space_to_tilde = tilde - space
+    from_space_to_tilde = tilde - space + 1
 
     freq = [0] * from_space_to_tilde
 
-    if msg not in None and len(msg) > 0:
-        for sym in msg:
-            sym_ascii = ord(sym)
-            if space <= sym_ascii <= tilde:
-                freq[sym_ascii] += 1
+    if msg is not None and len(msg) > 0:
+        # non-ASCII symbols are outside ' '..'~' anyway, drop them and count all bytes at once
+        ascii_bytes = msg.encode('ascii', 'ignore')
+        histogram = np.bincount(np.frombuffer(ascii_bytes, dtype=np.uint8), minlength=256)
+        freq = histogram[space:tilde + 1].tolist()
     return freq
 
 class Huffman_Node:
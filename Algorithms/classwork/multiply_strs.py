@@ -14,6 +14,10 @@ x * y = ac * 10 ^ n + (bc + ad) * 10 ^ m + bd
 
 hw: change the add_strs function to multiply the two strs without zero padding
 
+unbalanced lengths (e.g. 1,000,000 digits times 50): the longer str is cut in
+chunks of k digits, k = power of 2 >= length of the shorter one, so each
+chunk * shorter is a multiply_strs of two k-digit strs
+
 '''
 
 
@@ -75,11 +79,36 @@ def add_str(x, y):
         sum = sum % 10
         added_str = str(sum) + added_str
 
-        if carry > 1:
-            added_str = "1" + added_str
+    if carry > 0:  # the sum is one digit longer than x and y
+        added_str = str(carry) + added_str
     return added_str
 
+
+def multiply_strs_unbalanced(x, y):
+    # x, y have numeric symbols only, of any lengths
+    if len(x) < len(y):
+        x, y = y, x  # x is the longer one, cut in chunks
+    k = 1
+    while k < len(y):
+        k *= 2  # chunk length: power of 2 for multiply_strs
+    y = "0" * (k - len(y)) + y
+    x = "0" * (-len(x) % k) + x  # whole chunks only
+
+    # from the last chunk: x = ... + chunk * 10 ^ (k * i) + ...
+    # chunk * y has at most 2k digits; the last k go to the result,
+    # the rest are carried into the product of the next chunk
+    res_chunks = []
+    carry = "0"
+    for end in range(len(x), 0, -k):
+        chunk_y = add_str(multiply_strs(x[end - k:end], y), carry)
+        chunk_y = "0" * (k - len(chunk_y)) + chunk_y  # at least k digits
+        res_chunks.append(chunk_y[-k:])
+        carry = chunk_y[:-k] or "0"
+    res = carry + "".join(reversed(res_chunks))
+    return res.lstrip("0") or "0"
+
 x = "1234"
 y = "5678"
 
 print(multiply_strs(x, y))  # should print 7006652
+print(multiply_strs_unbalanced("1234567890", "56"))  # should print 69135801840
@@ -86,6 +86,40 @@ def dyn_prog(v, w, C):
   # that comprise the optimal solution
   return S
 
+def dyn_prog_value(v, w, C):
+  """Optimal value S[n][C] of dyn_prog, without the table.
+
+  Only the current row S[i] is kept, as a numpy array over capacities
+  0 ≤ j ≤ C. Adding item i updates every capacity j ≥ max(w[i], 1) at once:
+  S[i][j] = max(S[i-1][j], v[i] + S[i-1][j-w[i]]). Like dyn_prog, capacity 0
+  stays at 0 even for items of weight 0.
+
+  Inputs
+  ------
+  v : list
+    Values of items, with v[0] not used, as in dyn_prog.
+  w : list
+    Weights of items, with w[0] not used, as in dyn_prog.
+  C : int
+    Contraint for optimal solution; total weight of items in optimal
+    solution cannot exceed C.
+
+  Returns
+  -------
+  The optimal value S[n][C], using O(C) memory instead of O(nC)
+  """
+  n = len(v) - 1
+  row = np.zeros(C+1, dtype=np.result_type(*v[1:], 0)) # S[0]: no items, no value
+  for item in range(1, n+1):
+    weight, value = w[item], v[item]
+    if weight > C:
+      continue # fits at no capacity, S[item] == S[item-1]
+    lo = max(weight, 1) # dyn_prog starts at capacity 1
+    # The right-hand side is built from S[item-1] before any of it is
+    # overwritten, so each item is used at most once.
+    row[lo:] = np.maximum(row[lo:], row[lo-weight:C+1-weight] + value)
+  return row[C].item()
+
 def reconstruct(S,v,w):
   n, C = len(v) - 1, len(S[0]) - 1 # get n and C as the lengths of the item | capacity table
   best_loot_list = [] # initialize a list to store the best loot items in the optimal solution S(n, C)
@@ -104,6 +138,168 @@ def reconstruct(S,v,w):
 
   return best_loot_list[::-1] # return the loot list in reverse order
 
+def dyn_prog_decisions(v, w, C):
+  """dyn_prog_value that also records, for every item i and capacity j,
+  whether S[i][j] != S[i-1][j]: the one bit reconstruct reads from S. The
+  value and the bits are those of dyn_prog, items of weight 0 included.
+
+  Inputs
+  ------
+  v : list
+    Values of items, with v[0] not used, as in dyn_prog.
+  w : list
+    Weights of items, with w[0] not used, as in dyn_prog.
+  C : int
+    Contraint for optimal solution; total weight of items in optimal
+    solution cannot exceed C.
+
+  Returns
+  -------
+  value :
+    The optimal value S[n][C]
+  decisions : np.ndarray
+    (n+1) x ceil((C+1)/8) bytes, row i holding the bits of item i for
+    capacities 0 ≤ j ≤ C, packed with np.packbits. One bit per cell instead
+    of a boxed int, for reconstruct_decisions
+  """
+  n = len(v) - 1
+  row = np.zeros(C+1, dtype=np.result_type(*v[1:], 0))
+  decisions = np.zeros((n+1, (C+8)//8), dtype=np.uint8) # row 0 is never read
+  taken = np.zeros(C+1, dtype=bool)
+  for item in range(1, n+1):
+    weight, value = w[item], v[item]
+    if weight > C:
+      continue # never taken, its bits stay 0
+    lo = max(weight, 1) # capacity 0 is never updated, as in dyn_prog
+    taken[:] = False
+    with_item = row[lo-weight:C+1-weight] + value
+    taken[lo:] = with_item > row[lo:] # the max changed, as in reconstruct
+    decisions[item] = np.packbits(taken)
+    row[lo:] = np.maximum(row[lo:], with_item)
+  return row[C].item(), decisions
+
+def reconstruct_decisions(decisions, w, C):
+  """The list reconstruct(S, v, w) returns, from the packed decision bits of
+  dyn_prog_decisions instead of the full table S."""
+  n = len(decisions) - 1
+  best_loot_list = []
+  while n > 0 and C > 0: # same walk as reconstruct
+    if decisions[n][C >> 3] >> (7 - (C & 7)) & 1: # np.packbits is MSB-first
+      best_loot_list.append(n)
+      C -= w[n]
+    n -= 1
+  return best_loot_list[::-1]
+
+
+def knapsack_pareto(v, w, C):
+  """Optimal value S[n][C] from the Pareto front of (weight, value) states
+  instead of a row over all capacities.
+
+  After item i the states are the subsets of items 1..i that fit in C, minus
+  every state that another one dominates (no heavier, at least as valuable).
+  Sorted by weight, the values of the front are then strictly increasing,
+  and the best is the last. Adding an item shifts the front by (w[i], v[i]),
+  merges it with the old one and prunes again, so the work depends on the
+  size of the front, not on C.
+  """
+  n = len(v) - 1
+  weights = np.zeros(1, dtype=np.int64) # the empty subset
+  values = np.zeros(1, dtype=np.result_type(*v[1:], 0))
+  for item in range(1, n+1):
+    weight, value = w[item], v[item]
+    if weight > C or value <= 0:
+      continue # adds no state that is not dominated
+    fits = weights <= C - weight
+    weights = np.concatenate((weights, weights[fits] + weight))
+    values = np.concatenate((values, values[fits] + value))
+    order = np.lexsort((-values, weights)) # by weight, most valuable first
+    weights, values = weights[order], values[order]
+    # a state survives if it beats everything lighter (or as heavy)
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = values[1:] > np.maximum.accumulate(values)[:-1]
+    weights, values = weights[keep], values[keep]
+  return values[-1].item()
+
+def knapsack_by_value(v, w, C):
+  """Optimal value S[n][C] from a row over values instead of capacities, for
+  integer values with a small total.
+
+  M[k] is the lightest weight of a subset of the items seen so far worth
+  exactly k, updated per item like the capacity row of dyn_prog_value:
+  M[k] = min(M[k], w[i] + M[k-v[i]]). The answer is the largest k with
+  M[k] ≤ C, in O(n*sum(v)) time and O(sum(v)) memory.
+  """
+  n = len(v) - 1
+  total = sum(v[item] for item in range(1, n+1) if v[item] > 0 and w[item] <= C)
+  weight_type = np.result_type(*w[1:], C, 0) # float weights must not be truncated
+  lightest = np.full(total+1, C+1, dtype=weight_type) # C+1: worth k is not reachable in C
+  lightest[0] = 0
+  for item in range(1, n+1):
+    weight, value = w[item], v[item]
+    if weight > C or value <= 0:
+      continue # never in an optimal subset that fits
+    lightest[value:] = np.minimum(lightest[value:], lightest[:-value] + weight)
+  return int(np.flatnonzero(lightest <= C)[-1])
+
+KNAPSACK_ENGINES = ('capacity', 'value', 'pareto')
+DENSE_CELLS_LIMIT = 10**8 # largest n*C (or n*sum(v)) worth a dense row
+
+def choose_knapsack_engine(v, w, C):
+  """The engine knapsack uses for these items: a dense row over capacities
+  0..C ('capacity', dyn_prog_value) or over values 0..sum(v) ('value',
+  knapsack_by_value), whichever is shorter, unless that is still more than
+  DENSE_CELLS_LIMIT cells, when only the Pareto front is kept ('pareto')."""
+  n = len(v) - 1
+  items = [item for item in range(1, n+1) if w[item] <= C and v[item] > 0]
+  total = sum(v[item] for item in items)
+  integral_weights = all(isinstance(w[item], (int, np.integer)) for item in items)
+  integral_values = all(isinstance(v[item], (int, np.integer)) for item in items)
+  cells = {}
+  if integral_weights and isinstance(C, (int, np.integer)):
+    cells['capacity'] = n*(C+1)
+  if integral_values and integral_weights: # knapsack_by_value also adds up weights
+    cells['value'] = n*(total+1)
+  if not cells:
+    return 'pareto'
+  engine = min(cells, key=cells.get)
+  return engine if cells[engine] <= DENSE_CELLS_LIMIT else 'pareto'
+
+def knapsack(v, w, C, engine=None):
+  """Optimal value of the knapsack with the engine best suited to the
+  inputs, see choose_knapsack_engine.
+
+  Items of weight 0 are taken whenever they are worth something, before any
+  engine runs. dyn_prog never counts them at capacity 0, so with such items
+  its S[n][C] can be lower; without them this is S[n][C].
+
+  Inputs
+  ------
+  v, w, C :
+    As in dyn_prog.
+  engine : str
+    One of KNAPSACK_ENGINES to force it, or None to choose automatically.
+
+  Returns
+  -------
+  value :
+    The optimal value S[n][C]
+  engine : str
+    The engine that computed it
+  """
+  free = sum(v[item] for item in range(1, len(v)) if w[item] == 0 and v[item] > 0)
+  if free:
+    v, w = zip(*[(v[item], w[item]) for item in range(len(v)) if item == 0 or w[item] != 0])
+    value, engine = knapsack(list(v), list(w), C, engine)
+    return value + free, engine
+  if engine is None:
+    engine = choose_knapsack_engine(v, w, C)
+  if engine == 'capacity':
+    return dyn_prog_value(v, w, C), engine
+  if engine == 'value':
+    return knapsack_by_value(v, w, C), engine
+  if engine == 'pareto':
+    return knapsack_pareto(v, w, C), engine
+  raise ValueError("engine must be one of " + ", ".join(KNAPSACK_ENGINES))
 
 
 C = 6
@@ -123,4 +319,14 @@ v = [-1, 5, 4, 3, 2] # values
 
 S=dyn_prog(v,w,C)
 #print(np.matrix(S))
-print(reconstruct(S,v,w))
\ No newline at end of file
+print(reconstruct(S,v,w))
+print(dyn_prog_value(v,w,C)) # same as S[n][C], in O(C) memory
+value, decisions = dyn_prog_decisions(v,w,C)
+print(reconstruct_decisions(decisions,w,C)) # same items, one bit per cell
+print(knapsack(v,w,C)) # (9, 'capacity'): C+1 = 7 cells per row, sum(v)+1 = 15
+print(knapsack(v,[-1]+[weight*10**9 for weight in w[1:]],C*10**9)) # (9, 'value')
+print(knapsack([-1]+[value*10**9 for value in v[1:]],[-1]+[weight*10**9 for weight in w[1:]],C*10**9)) # 'pareto'
+print(knapsack([-1,10,10],[-1,0.6,0.6],1.0)) # (10, 'pareto'): float weights, both items do not fit
+value, decisions = dyn_prog_decisions([-1,5,3,4],[-1,0,2,2],2)
+print(value, reconstruct_decisions(decisions,[-1,0,2,2],2)) # 5 [1], as dyn_prog and reconstruct
+print(knapsack([-1,5,3,4],[-1,0,2,2],2)) # (9, 'capacity'): the weight 0 item is taken too
\ No newline at end of file
@@ -33,8 +33,80 @@ The Huffman Encoding algorithm requires these steps:
         d. concate the letters as the decoded msg, decode_msg
         e. return the decode_msg
 
+    Faster tree builders (same tree as build_Huffman_tree, so the same code lengths):
+        - build_Huffman_tree_heap: heapq keyed on (freq, insertion order) -> O(k log k)
+        - build_Huffman_tree_two_queue: leaves sorted by freq in one queue, merged nodes
+          in a second queue (their freqs only grow), pop the smaller front -> O(k)
+
+    Packed encoding (Huffman_code_generation_packed):
+        - every LR_path becomes an int code + bit length
+        - codes are shifted into an int accumulator, whole bytes go to a bytearray
+        - returns (packed bytes, number of bits), the last byte is padded with 0s
+
+    Table-driven decoding (decode_Huffman_packed):
+        - rebuild the tree from the encoding table
+        - table_bits is capped at the longest code, so small alphabets build small tables
+        - fill a lookup table indexed by the next table_bits bits: each entry holds all
+          the letters whose codes end inside those bits and their total length; codes
+          longer than table_bits give the tree node reached instead, and the rest of the
+          code is a normal tree walk
+        - peek table_bits bits, look up, consume only the bits of the decoded letters, repeat
+
+    Canonical codes (canonical_encoding_table) and the compact header:
+        - only the code length of every letter is kept from the tree
+        - letters are sorted by (code length, letter) and get consecutive codes, the code
+          is shifted left whenever the length grows -> same lengths, so same compression
+        - the header stores the max length, how many codes there are of every length and
+          the letters in canonical order; that is enough to rebuild the whole table
+
+    Streaming (Huffman_compress_stream / Huffman_decompress_stream):
+        - input comes in fixed-size chunks (read_chunks), so only one block is in memory
+        - pass 1 (optional): frequencies of the whole input, one canonical table for all blocks
+        - pass 2: every chunk is encoded as its own block, packed bytes start on a new byte
+        - without a pass 1 every block carries its own canonical header (one pass only)
+        - stream: per-block flag | global header | blocks | end marker (a 0 char block)
+        - block: varint chars | varint bits | [block header] | packed bytes
+        - every block decodes on its own, Huffman_block_index lists where they start
+        - chunks are strs: the header stores letters as utf-8 text, so bytes chunks (whose
+          frequency tables have int byte values, see frequencies_dict) are rejected
+        - Huffman_compress_file reads UTF-8 text only, other files cannot be compressed;
+          files are opened with newline='' so \r\n and \r come back unchanged
+
+    Parallel blocks (Huffman_encode_parallel / Huffman_decode_parallel):
+        - the message is cut into blocks, a process pool encodes them at the same time
+        - every worker gets the table once (pool initializer), not with every block
+        - the packed blocks are joined, the block index keeps (byte offset, bits, chars)
+        - decoding sends every block with its bits to the pool and joins the results in order
+
+    Adaptive Huffman, FGK (adaptive_Huffman_encode_stream / adaptive_Huffman_decode_stream):
+        - one pass, no frequency table: encoder and decoder grow the same tree as they go
+        - the tree starts as a single NYT (not yet transmitted) node
+        - a new letter is sent as the NYT code + its 21-bit code point, then the NYT node
+          splits into a new NYT (left) and a leaf for the letter (right)
+        - a known letter is sent as its current code
+        - update: from the letter's leaf up to the root, swap the node with the leader of
+          its weight block (first node of that weight in the order list) unless that is
+          its parent, then add 1 to its weight -> the sibling property holds again
+        - the stream ends with the NYT code + ADAPTIVE_EOF, so padding is never decoded
+
+    Length-limited codes, package-merge (length_limited_code_lengths):
+        - coins: every letter is a coin with its freq as value, in every one of max_len levels
+        - starting from the deepest level, pair up the sorted coins into packages and merge
+          the packages with the letters of the next level up, still sorted
+        - the 2k - 2 cheapest items of the last list are the optimal set: the code length of
+          a letter is how many times it is inside them
+        - canonical_code_lengths(freq_table, max_len) keeps the normal Huffman lengths when
+          they already fit, so the cap changes nothing for tables that don't need it
+
 
 '''
+import heapq
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np # for bulk byte counting with np.bincount
+
 class Huffman_Node: # Huffman node stores freq, sym, left  & right children
     """Plain node suitable for binary trees. The node stores a frequency and a
     symbol. When no symbol is given, the node considers it null, and stores only
@@ -47,16 +119,21 @@ class Huffman_Node: # Huffman node stores freq, sym, left  & right children
         self.left = None
         self.right = None
 
-def frequencies_dict(message: str) -> dict: # Frequency table method
-    """Returns the symbol frequency of a string as a dictionary."""
-    frequency = dict()  # Initialize a dictionary
-    if message is not None and len(message) > 0:  # Input not null and not empty
-        for symbol in message:  # For every symbol in the string
-            if symbol in frequency:  # If symbol already in dictionary
-                frequency[symbol] += 1  # increase frequency for this symbol
-            else:  # Symbol not in dictionary yet
-                frequency[symbol] = 1  # Initialize frequency for this symbol
-    return frequency  # Done
+def byte_histogram(data): # 256-entry histogram of a bytes-like object
+    return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+
+def frequencies_dict(message) -> dict: # Frequency table method
+    """Returns the symbol frequency of a string (or of the byte values of a
+    bytes-like object) as a dictionary, in order of first appearance."""
+    if message is None or len(message) == 0:  # Input null or empty
+        return dict()
+    if isinstance(message, (bytes, bytearray, memoryview)):  # Byte input, count in bulk
+        data = bytes(message) if isinstance(message, memoryview) else message
+        histogram = byte_histogram(data)
+        # keep the first appearance order of the loop version, ties in the tree depend on it
+        symbols = sorted(np.flatnonzero(histogram).tolist(), key=lambda b: data.find(bytes((b,))))
+        return {b: int(histogram[b]) for b in symbols}
+    return dict(Counter(message))  # Any other symbols, Counter keeps first appearance order
 
 def initialize_forest(freq_table): # Initializing forest method
     forest = [] # forest stores the Huffman nodes
@@ -86,6 +163,57 @@ def build_Huffman_tree(forest): # Building the tree method
 
     return forest[0] # return the root
 
+def build_Huffman_tree_heap(forest): # Building the tree with a priority queue
+    # Huffman_Node has no __lt__, so every heap entry is (freq, order, node). The order
+    # counter is the position the node would have in the list version of the forest
+    # (leaves first, merged roots appended at the end), so ties are broken exactly
+    # like min() does in build_Huffman_tree and the resulting tree is the same
+    heap = [(node.frequency, order, node) for order, node in enumerate(forest)]
+    heapq.heapify(heap) # O(k) heap construction
+    order = len(heap) # next insertion order for merged roots
+
+    while len(heap) > 1: # while there are at least two nodes to merge
+        freq1, _, min_freq_node1 = heapq.heappop(heap) # minimum freq node
+        freq2, _, min_freq_node2 = heapq.heappop(heap) # second minimum freq node
+
+        root = Huffman_Node(freq1 + freq2) # combined freq, null symbol
+        root.left = min_freq_node1
+        root.right = min_freq_node2
+
+        heapq.heappush(heap, (root.frequency, order, root)) # add the root of the subtree
+        order += 1
+
+    return heap[0][2] # return the root
+
+def build_Huffman_tree_two_queue(forest): # Building the tree in linear time for presorted freqs
+    # Two-queue method: leaves wait in ascending freq order in one queue, merged roots
+    # go to the back of a second queue. Each merged root is at least as big as the one
+    # before it, so both queues stay sorted and the two minimum nodes are always at the
+    # fronts. On equal freqs the leaf wins, matching the insertion order tie-break of
+    # build_Huffman_tree (leaves were in the forest before any merged root)
+    if any(forest[i].frequency > forest[i + 1].frequency for i in range(len(forest) - 1)):
+        forest = sorted(forest, key=lambda x: x.frequency) # not presorted - stable sort, O(k log k)
+
+    leaves = deque(forest) # queue of leaves, ascending freq
+    merged = deque() # queue of merged roots, ascending freq
+
+    def pop_min_freq_node(): # pop the smaller of the two queue fronts
+        if not merged or (leaves and leaves[0].frequency <= merged[0].frequency):
+            return leaves.popleft()
+        return merged.popleft()
+
+    while len(leaves) + len(merged) > 1: # while there are at least two nodes to merge
+        min_freq_node1 = pop_min_freq_node()
+        min_freq_node2 = pop_min_freq_node()
+
+        root = Huffman_Node(min_freq_node1.frequency + min_freq_node2.frequency)
+        root.left = min_freq_node1
+        root.right = min_freq_node2
+
+        merged.append(root) # add the root of the subtree
+
+    return merged[0] if merged else leaves[0] # return the root
+
 def generate_encoding_table_DFS(Huffman_tree_root, LR_path='', encoding_table=None): # encoding table - DFS method
     
     if encoding_table is None: # if there is no encoding table, return it
@@ -107,16 +235,52 @@ def Huffman_code_generation(encoding_table, msg): # encoding in bits method
         encoded_msg += encoding_table[letter] # add the bits of the path of the letter
     return encoded_msg # return the encoded message
 
-def generate_compression_report(encoded_msg, msg): # generate report
+def msg_len_MBps(msg, seconds): # throughput of 8-bit chars in MB/s
+    return len(msg) / seconds / 1e6 if seconds else float('inf')
+
+def encoding_table_to_bits(encoding_table): # LR_path strs -> (code, length) ints
+    bit_table = {} # bit_table stores symbol -> (code as int, number of bits)
+    for letter, LR_path in encoding_table.items():
+        bit_table[letter] = (int(LR_path, 2) if LR_path else 0, len(LR_path))
+    return bit_table
+
+def Huffman_code_generation_packed(encoding_table, msg): # encoding in packed bits method
+    bit_table = encoding_table_to_bits(encoding_table)
+    packed = bytearray() # whole bytes of the encoded message
+    acc = 0 # bit accumulator, holds the bits not yet written to packed
+    acc_len = 0 # number of bits in acc
+    bit_length = 0 # total number of bits in the encoded message
+    for letter in msg: # for every letter in the original msg
+        code, length = bit_table[letter]
+        acc = (acc << length) | code # shift the code in at the right
+        acc_len += length
+        if acc_len >= 64: # flush whole bytes, keep the leftover bits in acc
+            n_bytes = acc_len >> 3
+            acc_len &= 7
+            packed += (acc >> acc_len).to_bytes(n_bytes, 'big')
+            bit_length += n_bytes << 3
+            acc &= (1 << acc_len) - 1
+    bit_length += acc_len
+    if acc_len: # pad the last byte with 0s on the right
+        n_bytes = (acc_len + 7) >> 3
+        packed += (acc << (8 * n_bytes - acc_len)).to_bytes(n_bytes, 'big')
+    return bytes(packed), bit_length # return packed bytes and the number of bits used
+
+def generate_compression_report(encoded_msg, msg, bit_length=None, seconds=None): # generate report
+    # encoded_msg is either the '0'/'1' str or the packed bytes - then bit_length is needed
     msg_len = len(msg)
     storage_req = 8 * msg_len
-    encoded_msg_len = len(encoded_msg)
-    net_compression = 100 * (1 - (encoded_msg_len / storage_req))
+    if bit_length is None: # '0'/'1' str, one char per bit
+        bit_length = len(encoded_msg)
+    encoded_bytes = (bit_length + 7) // 8 # real size of the packed payload
+    net_compression = 100 * (1 - (bit_length / storage_req))
 
     print("Input string length:", msg_len, "characters")
-    print("8-bit storage required:", storage_req, "bits")
-    print("Encoded string length:", encoded_msg_len, "bits")
+    print("8-bit storage required:", storage_req, "bits", "(" + str(msg_len), "bytes)")
+    print("Encoded string length:", bit_length, "bits", "(" + str(encoded_bytes), "bytes packed)")
     print("Net compression:", net_compression, "%")
+    if seconds: # throughput of the input side, 8-bit chars
+        print("Throughput:", msg_len_MBps(msg, seconds), "MB/s")
 
 def decoded_Huffman_encrypted_msg(encoded_msg, encoding_table): # decode encoded message
     decoded_msg = '' # decoded_msg stores the decoded mesage of letters
@@ -132,6 +296,564 @@ def decoded_Huffman_encrypted_msg(encoded_msg, encoding_table): # decode encoded
             
     return decoded_msg # return the decoded message
 
+def build_decoding_tree(encoding_table): # rebuild the Huffman tree from LR_paths
+    root = Huffman_Node(0) # frequencies are not needed for decoding
+    for letter, LR_path in encoding_table.items():
+        node = root
+        for bit in LR_path: # walk down, creating the internal nodes on the way
+            if bit == '0':
+                if node.left is None:
+                    node.left = Huffman_Node(0)
+                node = node.left
+            else:
+                if node.right is None:
+                    node.right = Huffman_Node(0)
+                node = node.right
+        node.symbol = letter # the leaf at the end of the path holds the letter
+    return root
+
+def build_decoding_table(Huffman_tree_root, table_bits): # lookup table for table_bits bits at a time
+    # Entry for every table_bits-bit index: (letters, bits used, node)
+    #   letters - every letter whose code ends inside the index bits, in order
+    #   bits used - total length of those codes, only these bits get consumed
+    #   node - when not even one code fits, the node reached after table_bits bits
+    table = []
+    for index in range(1 << table_bits):
+        letters = []
+        used = 0
+        node = Huffman_tree_root
+        for depth in range(1, table_bits + 1): # walk the tree along the bits of index
+            bit = (index >> (table_bits - depth)) & 1
+            node = node.right if bit else node.left
+            if node is None: # path not in the code, the message can't contain it
+                break
+            if node.symbol is not None: # leaf - one more letter, start over at the root
+                letters.append(node.symbol)
+                used = depth
+                node = Huffman_tree_root
+        if letters or node is None:
+            table.append((tuple(letters), used, None))
+        else:
+            table.append(((), table_bits, node)) # code longer than table_bits
+    return table
+
+def prepare_decoding(encoding_table, table_bits=12): # tree + lookup table, reusable for many messages
+    Huffman_tree_root = build_decoding_tree(encoding_table)
+    longest_code = max((len(code) for code in encoding_table.values()), default=1)
+    table_bits = max(1, min(table_bits, longest_code)) # small alphabets get small tables
+    return Huffman_tree_root, build_decoding_table(Huffman_tree_root, table_bits), table_bits
+
+def decode_Huffman_packed(packed, bit_length, encoding_table, table_bits=12): # table-driven decoding
+    return decode_Huffman_packed_prepared(packed, bit_length, prepare_decoding(encoding_table, table_bits))
+
+def decode_Huffman_packed_prepared(packed, bit_length, decoding): # decoding from prepare_decoding
+    Huffman_tree_root, table, table_bits = decoding
+    mask = (1 << table_bits) - 1
+
+    decoded = [] # decoded letters, joined at the end
+    acc = 0 # bit buffer, only the low acc_len bits are unread
+    acc_len = 0
+    pos = 0 # next byte of packed to load
+    remaining = bit_length # bits still to decode
+    while remaining >= table_bits: # whole lookups, the tail is done below
+        if acc_len < table_bits: # refill 4 bytes at a time so we can peek table_bits bits
+            acc = ((acc & ((1 << acc_len) - 1)) << 32) | int.from_bytes(packed[pos:pos + 4].ljust(4, b'\0'), 'big')
+            pos += 4
+            acc_len += 32
+        letters, used, node = table[(acc >> (acc_len - table_bits)) & mask]
+        acc_len -= used
+        remaining -= used
+        if letters: # one lookup, several letters
+            decoded.extend(letters)
+            continue
+
+        while node.symbol is None: # long code, walk the rest of it bit by bit
+            if acc_len == 0:
+                acc = packed[pos] if pos < len(packed) else 0
+                pos += 1
+                acc_len = 8
+            acc_len -= 1
+            remaining -= 1
+            node = node.right if (acc >> acc_len) & 1 else node.left
+        decoded.append(node.symbol)
+
+    node = Huffman_tree_root
+    while remaining > 0: # tail shorter than table_bits - plain tree walk, ignores the padding
+        if acc_len == 0:
+            acc = packed[pos] if pos < len(packed) else 0
+            pos += 1
+            acc_len = 8
+        acc_len -= 1
+        remaining -= 1
+        node = node.right if (acc >> acc_len) & 1 else node.left
+        if node.symbol is not None:
+            decoded.append(node.symbol)
+            node = Huffman_tree_root
+
+    return ''.join(decoded) # return the decoded message
+
+def code_lengths_dict(encoding_table): # symbol -> length of its LR_path
+    # a one letter alphabet gets the path '' from the DFS, canonical codes give it '0'
+    return {letter: max(1, len(LR_path)) for letter, LR_path in encoding_table.items()}
+
+def canonical_encoding_table(code_lengths): # canonical LR_paths from the code lengths only
+    encoding_table = {}
+    code = 0 # next code to hand out
+    prev_len = 0 # length of the previous code
+    for letter in sorted(code_lengths, key=lambda x: (code_lengths[x], x)): # by length, then letter
+        length = code_lengths[letter]
+        code <<= length - prev_len # longer codes continue from the shorter ones, shifted left
+        encoding_table[letter] = format(code, '0' + str(length) + 'b')
+        code += 1
+        prev_len = length
+    return encoding_table
+
+def encode_varint(n): # LEB128 - 7 bits per byte, high bit set when more bytes follow
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+def decode_varint(data, pos): # returns the number and the position after it
+    n = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+def serialize_canonical_header(code_lengths): # compact header for a canonical code
+    # max length | count of codes for lengths 1..max | symbol kind | letters in canonical order
+    #   kind 0: every letter is one char -> varint byte count + the utf-8 of all letters
+    #   kind 1: letters are longer strs -> varint byte count + utf-8 for every letter
+    letters = sorted(code_lengths, key=lambda x: (code_lengths[x], x))
+    max_len = max(code_lengths.values(), default=0)
+    counts = [0] * (max_len + 1)
+    for length in code_lengths.values():
+        counts[length] += 1
+
+    header = bytearray(encode_varint(max_len))
+    for length in range(1, max_len + 1):
+        header += encode_varint(counts[length])
+    if all(len(letter) == 1 for letter in letters):
+        letters_bytes = ''.join(letters).encode('utf-8')
+        header.append(0)
+        header += encode_varint(len(letters_bytes)) + letters_bytes
+    else:
+        header.append(1)
+        for letter in letters:
+            letter_bytes = letter.encode('utf-8')
+            header += encode_varint(len(letter_bytes)) + letter_bytes
+    return bytes(header)
+
+def deserialize_canonical_header(header, pos=0): # returns (encoding table, position after header)
+    max_len, pos = decode_varint(header, pos)
+    counts = [0] * (max_len + 1)
+    for length in range(1, max_len + 1):
+        counts[length], pos = decode_varint(header, pos)
+    kind = header[pos]
+    pos += 1
+    if kind == 0:
+        n_bytes, pos = decode_varint(header, pos)
+        letters = list(bytes(header[pos:pos + n_bytes]).decode('utf-8'))
+        pos += n_bytes
+    else:
+        letters = []
+        for _ in range(sum(counts)):
+            n_bytes, pos = decode_varint(header, pos)
+            letters.append(bytes(header[pos:pos + n_bytes]).decode('utf-8'))
+            pos += n_bytes
+
+    code_lengths = {} # letters are already in canonical order, lengths follow the counts
+    i = 0
+    for length in range(1, max_len + 1):
+        for _ in range(counts[length]):
+            code_lengths[letters[i]] = length
+            i += 1
+    return canonical_encoding_table(code_lengths), pos
+
+def read_chunks(stream, chunk_size): # yield fixed-size chunks until the stream runs out
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def frequencies_dict_stream(chunks): # frequency table over many chunks
+    frequency = dict()
+    for chunk in chunks:
+        for symbol, freq in frequencies_dict(chunk).items(): # count a chunk, merge it in
+            frequency[symbol] = frequency.get(symbol, 0) + freq
+    return frequency
+
+def length_limited_code_lengths(freq_table, max_len): # optimal code lengths, none over max_len
+    letters = sorted(freq_table, key=lambda x: freq_table[x]) # stable, ties keep the table order
+    if len(letters) == 1:
+        return {letters[0]: 1}
+    if len(letters) > (1 << max_len):
+        raise ValueError("cannot code " + str(len(letters)) + " letters in at most " + str(max_len) + " bits")
+
+    # item = (freq, letter, left item, right item): a letter coin or a package of two items
+    coins = [(freq_table[letter], letter, None, None) for letter in letters]
+    items = coins
+    for _ in range(max_len - 1): # one level up per round
+        packages = [(items[i][0] + items[i + 1][0], None, items[i], items[i + 1])
+                    for i in range(0, len(items) - 1, 2)]
+        merged = [] # merge the letters and the packages, both sorted by freq
+        i = j = 0
+        while i < len(coins) or j < len(packages):
+            if j == len(packages) or (i < len(coins) and coins[i][0] <= packages[j][0]):
+                merged.append(coins[i])
+                i += 1
+            else:
+                merged.append(packages[j])
+                j += 1
+        items = merged
+
+    code_lengths = dict.fromkeys(freq_table, 0)
+    stack = items[:2 * len(letters) - 2] # the cheapest 2k - 2 items
+    while stack: # count how many times every letter is inside them
+        freq, letter, left, right = stack.pop()
+        if letter is not None:
+            code_lengths[letter] += 1
+        else:
+            stack.append(left)
+            stack.append(right)
+    return code_lengths
+
+def canonical_code_lengths(freq_table, max_len=None): # freq table -> code lengths of the Huffman code
+    Huffman_tree = build_Huffman_tree_heap(initialize_forest(freq_table))
+    code_lengths = code_lengths_dict(generate_encoding_table_DFS(Huffman_tree))
+    if max_len is not None and max(code_lengths.values()) > max_len: # too long, cap with package-merge
+        code_lengths = length_limited_code_lengths(freq_table, max_len)
+    return code_lengths
+
+def read_varint_stream(stream): # decode_varint, one byte at a time from a stream
+    n = 0
+    shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte: # end of stream before the varint
+            raise EOFError("truncated Huffman stream")
+        n |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return n
+        shift += 7
+
+def read_canonical_header_stream(stream): # deserialize_canonical_header from a stream
+    header = bytearray()
+
+    def read_varint_copy(): # read a varint and keep its bytes for the header
+        n = read_varint_stream(stream)
+        header.extend(encode_varint(n))
+        return n
+
+    max_len = read_varint_copy()
+    n_letters = 0
+    for _ in range(max_len):
+        n_letters += read_varint_copy()
+    kind = stream.read(1)
+    header += kind
+    if kind[0] == 0:
+        header += stream.read(read_varint_copy())
+    else:
+        for _ in range(n_letters):
+            header += stream.read(read_varint_copy())
+    return deserialize_canonical_header(header)[0]
+
+def Huffman_compress_stream(chunks, out_stream, code_lengths=None, max_code_len=None): # encode block by block
+    # code_lengths from a first pass (canonical_code_lengths(frequencies_dict_stream(...)))
+    # give one table for every block, None means every block gets its own table
+    # (with codes capped at max_code_len bits when given)
+    per_block = code_lengths is None
+    out_stream.write(bytes([per_block]))
+    if not per_block:
+        out_stream.write(serialize_canonical_header(code_lengths))
+        encoding_table = canonical_encoding_table(code_lengths)
+
+    for chunk in chunks:
+        if not isinstance(chunk, str): # int byte symbols do not fit the utf-8 header
+            raise TypeError("Huffman streams code str chunks, not " + type(chunk).__name__)
+        if per_block: # table from this block's frequencies only
+            block_lengths = canonical_code_lengths(frequencies_dict(chunk), max_code_len)
+            encoding_table = canonical_encoding_table(block_lengths)
+        packed, bit_length = Huffman_code_generation_packed(encoding_table, chunk)
+        out_stream.write(encode_varint(len(chunk)) + encode_varint(bit_length))
+        if per_block:
+            out_stream.write(serialize_canonical_header(block_lengths))
+        out_stream.write(packed)
+    out_stream.write(encode_varint(0)) # end marker
+
+def read_Huffman_stream_header(stream): # returns (per_block, global encoding table or None)
+    per_block = stream.read(1)[0] == 1
+    return per_block, None if per_block else read_canonical_header_stream(stream)
+
+def read_Huffman_block(stream, per_block, decoding=None): # next decoded block, None at the end
+    # decoding is prepare_decoding of the global table, not used with per-block tables
+    n_chars = read_varint_stream(stream)
+    if n_chars == 0: # end marker
+        return None
+    bit_length = read_varint_stream(stream)
+    if per_block:
+        decoding = prepare_decoding(read_canonical_header_stream(stream))
+    return decode_Huffman_packed_prepared(stream.read((bit_length + 7) // 8), bit_length, decoding)
+
+def Huffman_decompress_stream(stream): # yield the decoded blocks in order
+    per_block, encoding_table = read_Huffman_stream_header(stream)
+    decoding = None if per_block else prepare_decoding(encoding_table)
+    while True:
+        block = read_Huffman_block(stream, per_block, decoding)
+        if block is None:
+            return
+        yield block
+
+def Huffman_block_index(stream): # [(offset, chars)] of every block, to seek and decode one block
+    per_block, _ = read_Huffman_stream_header(stream)
+    index = []
+    while True:
+        offset = stream.tell()
+        n_chars = read_varint_stream(stream)
+        if n_chars == 0:
+            return index
+        bit_length = read_varint_stream(stream)
+        if per_block:
+            read_canonical_header_stream(stream)
+        stream.seek((bit_length + 7) // 8, 1) # skip the packed bytes
+        index.append((offset, n_chars))
+
+def Huffman_compress_file(in_path, out_path, block_size=1 << 20, per_block_tables=False,
+                          max_code_len=None): # UTF-8 text file -> file
+    code_lengths = None
+    if not per_block_tables: # pass 1 - frequencies of the whole file
+        with open(in_path, encoding='utf-8', newline='') as in_file: # keep line endings as they are
+            freq_table = frequencies_dict_stream(read_chunks(in_file, block_size))
+        code_lengths = canonical_code_lengths(freq_table, max_code_len) if freq_table else {}
+    with open(in_path, encoding='utf-8', newline='') as in_file, open(out_path, 'wb') as out_file: # pass 2
+        Huffman_compress_stream(read_chunks(in_file, block_size), out_file, code_lengths, max_code_len)
+
+def Huffman_decompress_file(in_path, out_path): # compressed file -> UTF-8 text file
+    with open(in_path, 'rb') as in_file, open(out_path, 'w', encoding='utf-8', newline='') as out_file:
+        for block in Huffman_decompress_stream(in_file):
+            out_file.write(block)
+
+worker_state = {} # tables of a pool worker process, set once by init_Huffman_worker
+
+def init_Huffman_worker(encoding_table, decode): # pool initializer
+    worker_state['encoding_table'] = encoding_table
+    if decode: # the decoding tree + lookup table are built once per worker
+        worker_state['decoding'] = prepare_decoding(encoding_table)
+
+def encode_block_worker(block): # runs in a worker process
+    return Huffman_code_generation_packed(worker_state['encoding_table'], block)
+
+def decode_block_worker(packed_block): # runs in a worker process, packed_block = (packed, bits)
+    packed, bit_length = packed_block
+    return decode_Huffman_packed_prepared(packed, bit_length, worker_state['decoding'])
+
+def Huffman_encode_parallel(msg, encoding_table, block_size=1 << 20, workers=None): # multi-core encoding
+    blocks = [msg[i:i + block_size] for i in range(0, len(msg), block_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_Huffman_worker,
+                             initargs=(encoding_table, False)) as pool:
+        encoded_blocks = list(pool.map(encode_block_worker, blocks))
+
+    packed = bytearray() # every block starts on a new byte
+    block_index = [] # (byte offset, number of bits, number of chars) of every block
+    for block, (block_packed, bit_length) in zip(blocks, encoded_blocks):
+        block_index.append((len(packed), bit_length, len(block)))
+        packed += block_packed
+    return bytes(packed), block_index
+
+def Huffman_decode_parallel(packed, block_index, encoding_table, workers=None): # multi-core decoding
+    packed_blocks = [(packed[offset:offset + (bit_length + 7) // 8], bit_length)
+                     for offset, bit_length, _ in block_index]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_Huffman_worker,
+                             initargs=(encoding_table, True)) as pool:
+        return ''.join(pool.map(decode_block_worker, packed_blocks))
+
+ADAPTIVE_EOF = (1 << 21) - 1 # escape value after the last code point, marks the end of a stream
+
+class Adaptive_Huffman_Node: # node of the adaptive tree, also knows its parent
+    def __init__(self, weight=0, symbol=None, parent=None):
+        self.weight = weight
+        self.symbol = symbol
+        self.parent = parent
+        self.left = None
+        self.right = None
+        self.number = 0 # position in the order list of the tree, 0 is the root
+
+class Adaptive_Huffman_Tree: # FGK tree, the same on the encoder and the decoder side
+    def __init__(self):
+        self.NYT = Adaptive_Huffman_Node() # not yet transmitted, always weight 0
+        self.root = self.NYT
+        self.order = [self.root] # nodes by decreasing node number, weights never grow along it
+        self.leaves = {} # symbol -> leaf
+
+    def code(self, node): # path from the root to node as (code as int, number of bits)
+        code = 0
+        length = 0
+        while node.parent is not None:
+            if node is node.parent.right:
+                code |= 1 << length
+            length += 1
+            node = node.parent
+        return code, length
+
+    def add_symbol(self, symbol): # split NYT into a new NYT (left) and a leaf (right)
+        old_NYT = self.NYT
+        leaf = Adaptive_Huffman_Node(0, symbol, old_NYT)
+        self.NYT = Adaptive_Huffman_Node(0, None, old_NYT)
+        old_NYT.left = self.NYT
+        old_NYT.right = leaf
+        leaf.number = len(self.order)
+        self.order.append(leaf)
+        self.NYT.number = len(self.order)
+        self.order.append(self.NYT)
+        self.leaves[symbol] = leaf
+        return leaf
+
+    def swap(self, a, b): # swap two subtrees, neither is an ancestor of the other
+        a_parent = a.parent
+        b_parent = b.parent
+        if a_parent is b_parent:
+            a_parent.left, a_parent.right = a_parent.right, a_parent.left
+        else:
+            if a_parent.left is a:
+                a_parent.left = b
+            else:
+                a_parent.right = b
+            if b_parent.left is b:
+                b_parent.left = a
+            else:
+                b_parent.right = a
+            a.parent = b_parent
+            b.parent = a_parent
+        self.order[a.number], self.order[b.number] = b, a
+        a.number, b.number = b.number, a.number
+
+    def update(self, symbol): # count one more symbol
+        node = self.leaves.get(symbol)
+        if node is None:
+            node = self.add_symbol(symbol)
+        while node is not None: # up to the root
+            leader = node.number # first node of the same weight in the order list
+            while leader > 0 and self.order[leader - 1].weight == node.weight:
+                leader -= 1
+            leader = self.order[leader]
+            if leader is not node and leader is not node.parent:
+                self.swap(node, leader)
+            node.weight += 1
+            node = node.parent
+
+def flush_whole_bytes(acc, acc_len, out): # move the whole bytes of a bit accumulator to out
+    n_bytes = acc_len >> 3
+    if n_bytes:
+        acc_len &= 7
+        out += (acc >> acc_len).to_bytes(n_bytes, 'big')
+        acc &= (1 << acc_len) - 1
+    return acc, acc_len
+
+def adaptive_Huffman_encode_stream(chunks): # one pass encoding, yields the bytes of every chunk
+    tree = Adaptive_Huffman_Tree()
+    acc = 0 # bits not written yet
+    acc_len = 0
+    for chunk in chunks:
+        out = bytearray()
+        for letter in chunk:
+            leaf = tree.leaves.get(letter)
+            if leaf is None: # new letter - NYT code, then the code point
+                code, length = tree.code(tree.NYT)
+                code = (code << 21) | ord(letter)
+                length += 21
+            else:
+                code, length = tree.code(leaf)
+            acc = (acc << length) | code
+            acc_len += length
+            tree.update(letter)
+            if acc_len >= 64:
+                acc, acc_len = flush_whole_bytes(acc, acc_len, out)
+        acc, acc_len = flush_whole_bytes(acc, acc_len, out)
+        yield bytes(out) # only whole bytes, the rest waits for the next chunk
+
+    code, length = tree.code(tree.NYT) # end of stream
+    acc = (acc << (length + 21)) | (code << 21) | ADAPTIVE_EOF
+    acc_len += length + 21
+    acc <<= -acc_len % 8 # pad the last byte with 0s
+    acc_len += -acc_len % 8
+    out = bytearray()
+    flush_whole_bytes(acc, acc_len, out)
+    yield bytes(out)
+
+def adaptive_Huffman_decode_stream(byte_chunks): # one pass decoding, yields the letters of every chunk
+    tree = Adaptive_Huffman_Tree()
+    node = tree.root
+    escape_len = 0 # bits of a code point read so far, None when walking the tree
+    escape = 0
+    for chunk in byte_chunks:
+        out = []
+        for byte in chunk:
+            for shift in range(7, -1, -1):
+                bit = (byte >> shift) & 1
+                if escape_len is None: # walk one step down the tree
+                    node = node.right if bit else node.left
+                    if node.symbol is not None: # known letter
+                        out.append(node.symbol)
+                        tree.update(node.symbol)
+                        node = tree.root
+                    if node is tree.NYT: # code point of a new letter follows
+                        escape_len = 0
+                        escape = 0
+                    continue
+
+                escape = (escape << 1) | bit
+                escape_len += 1
+                if escape_len == 21:
+                    if escape == ADAPTIVE_EOF: # end of stream, the rest is padding
+                        yield ''.join(out)
+                        return
+                    out.append(chr(escape))
+                    tree.update(chr(escape))
+                    node = tree.root
+                    escape_len = None
+        yield ''.join(out)
+
+def adaptive_Huffman_encode(msg): # whole message -> packed bytes, ends with the NYT + EOF code
+    return b''.join(adaptive_Huffman_encode_stream([msg]))
+
+def adaptive_Huffman_decode(packed): # packed bytes -> message
+    return ''.join(adaptive_Huffman_decode_stream([packed]))
+
+def compare_adaptive_static(msg): # size and speed of the static (canonical) vs adaptive codecs
+    start = time.perf_counter() # static: frequency pass, header, packed message
+    code_lengths = canonical_code_lengths(frequencies_dict(msg))
+    encoding_table = canonical_encoding_table(code_lengths)
+    header = serialize_canonical_header(code_lengths)
+    packed_msg, bit_length = Huffman_code_generation_packed(encoding_table, msg)
+    static_encode = time.perf_counter() - start
+    start = time.perf_counter()
+    static_ok = decode_Huffman_packed(packed_msg, bit_length, deserialize_canonical_header(header)[0]) == msg
+    static_decode = time.perf_counter() - start
+    static_size = len(header) + len(packed_msg)
+
+    start = time.perf_counter() # adaptive: one pass
+    adaptive_msg = adaptive_Huffman_encode(msg)
+    adaptive_encode = time.perf_counter() - start
+    start = time.perf_counter()
+    adaptive_ok = adaptive_Huffman_decode(adaptive_msg) == msg
+    adaptive_decode = time.perf_counter() - start
+
+    print("Input:", len(msg), "characters")
+    print("Static:  ", static_size, "bytes, ratio", static_size / len(msg),
+          "| encode", msg_len_MBps(msg, static_encode), "MB/s, decode", msg_len_MBps(msg, static_decode),
+          "MB/s", "| round trip ok" if static_ok else "| round trip FAILED")
+    print("Adaptive:", len(adaptive_msg), "bytes, ratio", len(adaptive_msg) / len(msg),
+          "| encode", msg_len_MBps(msg, adaptive_encode), "MB/s, decode", msg_len_MBps(msg, adaptive_decode),
+          "MB/s", "| round trip ok" if adaptive_ok else "| round trip FAILED")
+
 def main():
     msg = "HELLO WORLD"
     freq_dict = frequencies_dict(msg)
@@ -145,6 +867,12 @@ def main():
     print("Encoding table:", encoding_table)
     generate_compression_report(encoded_msg, msg)
 
+    start = time.perf_counter()
+    packed_msg, bit_length = Huffman_code_generation_packed(encoding_table, msg)
+    stop = time.perf_counter()
+    print("Packed message:", packed_msg.hex(), "-", bit_length, "bits")
+    generate_compression_report(packed_msg, msg, bit_length, stop - start)
+
     print("Let's decode....")
     decoded_msg = decoded_Huffman_encrypted_msg(encoded_msg, encoding_table)
 
@@ -153,4 +881,40 @@ def main():
     else:
         print("Decoding failed.")
 
-main()
+    start = time.perf_counter()
+    decoded_msg = decode_Huffman_packed(packed_msg, bit_length, encoding_table)
+    stop = time.perf_counter()
+    if decoded_msg == msg:
+        print("Packed message -> Original message: Success!", msg_len_MBps(msg, stop - start), "MB/s")
+    else:
+        print("Packed decoding failed.")
+
+    canonical_table = canonical_encoding_table(code_lengths_dict(encoding_table))
+    header = serialize_canonical_header(code_lengths_dict(encoding_table))
+    print("Canonical encoding table:", canonical_table)
+    print("Canonical header:", len(header), "bytes vs", len(str(encoding_table)), "bytes for the table as text")
+    packed_msg, bit_length = Huffman_code_generation_packed(canonical_table, msg)
+    header_table, _ = deserialize_canonical_header(header)
+    if decode_Huffman_packed(packed_msg, bit_length, header_table) == msg:
+        print("Canonical header + packed message -> Original message: Success!")
+    else:
+        print("Canonical decoding failed.")
+
+    packed_msg, block_index = Huffman_encode_parallel(msg, canonical_table, block_size=4)
+    if Huffman_decode_parallel(packed_msg, block_index, canonical_table) == msg:
+        print("Parallel blocks", block_index, "-> Original message: Success!")
+    else:
+        print("Parallel decoding failed.")
+
+    if adaptive_Huffman_decode(adaptive_Huffman_encode(msg)) == msg:
+        print("Adaptive (one pass) ->", len(adaptive_Huffman_encode(msg)), "bytes -> Original message: Success!")
+    else:
+        print("Adaptive decoding failed.")
+    compare_adaptive_static(msg * 2000)
+
+    fibonacci = {chr(ord('a') + i): f for i, f in enumerate([1, 1, 2, 3, 5, 8, 13, 21, 34, 55])}
+    print("Fibonacci freqs, Huffman code lengths:", canonical_code_lengths(fibonacci))
+    print("Fibonacci freqs, capped at 5 bits:    ", canonical_code_lengths(fibonacci, 5))
+
+if __name__ == "__main__": # pool workers import this file, only run the demo once
+    main()
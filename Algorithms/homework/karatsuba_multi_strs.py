@@ -4,9 +4,27 @@ import math
 import pandas as pd 
 import matplotlib.pyplot as grph
 import sys
+import os
+import json
+import platform
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
 sys.set_int_max_str_digits(0)
 
+DIGITS_PER_LIMB = 4 # decimal digits held by one limb
+LIMB_BASE = 10 ** DIGITS_PER_LIMB
+KARATSUBA_LIMB_CUTOFF = 512 # limbs (3 or more); below this np.convolve (schoolbook) is faster
+# where hybrid_limbs switches algorithm, measured once per host by calibrate_thresholds
+THRESHOLDS_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "karatsuba_multi_strs.json")
+limb_thresholds = {} # schoolbook, toom3 and fft cutoffs in limbs, filled by load_thresholds
+FFT_DIGIT_BASE = 100 # limbs are split in two for the FFT, so coefficients stay far below 2^53
+# Smaller products run serially. Starting the pool and moving the buffers cost
+# 10-20 ms here, and a 2^16-limb product takes about 20 ms alone, so 2^17 is
+# the first size where the pool clearly pays (measured on one core, see
+# parallel_karatsuba_limbs)
+PARALLEL_MIN_LIMBS = 1 << 17
+
 def mult_str(x,y):
     """ Performs basic multiplication between two non-negative integers that
     are represented as strings whose length must be a power of 2.
@@ -54,7 +72,28 @@ def mult_str(x,y):
         # Done
         return str(int(ac10n)+int(bcad10m)+int(bd))
 
-def karatsuba_strs(x, y): 
+def karatsuba_strs(x, y):
+    """ Karatsuba multiplication of two non-negative integers represented as
+    strings of any length, the same product as mult_str and
+    karatsuba_strs_recursive.
+
+    The digits are converted once to base 10^4 limbs, multiplied by
+    karatsuba_limbs and converted back once, instead of splitting, padding
+    and converting strings at every level of the recursion.
+
+    Inputs
+    ------
+    x, y : string
+      Strings containing the integers to multiply. Must be non-negative.
+
+    Returns
+    -------
+    string
+      With the integer that corresponds to the product x*y
+    """
+    return limbs_to_str(karatsuba_limbs(str_to_limbs(x), str_to_limbs(y)))
+
+def karatsuba_strs_recursive(x, y):
 
     if len(x) == len(y) == 1:
        # Base case - x and y are length of 1, add them and convert back to str
@@ -85,11 +124,11 @@ def karatsuba_strs(x, y):
         c = y[:m] # left half of y
         d = y[m:] # right half of y
 
-        ac = karatsuba_strs(a, c) # recursively multiply a and c
-        bd = karatsuba_strs(b, d) # recursively multiply b and d
+        ac = karatsuba_strs_recursive(a, c) # recursively multiply a and c
+        bd = karatsuba_strs_recursive(b, d) # recursively multiply b and d
 
         # (𝑎+𝑏)(𝑐+𝑑)−𝑎𝑐−𝑏𝑑 calculation 
-        a_plus_b_x_c_plus_d = karatsuba_strs(str(int(a) + int(b)), str(int(c) + int(d)))
+        a_plus_b_x_c_plus_d = karatsuba_strs_recursive(str(int(a) + int(b)), str(int(c) + int(d)))
         a_plus_b_x_c_plus_d_rm = str(int(a_plus_b_x_c_plus_d) - int(ac) - int(bd))
 
         ac10n = ac + "0" * n # padding ac * 10 ^ n with zeros
@@ -98,8 +137,376 @@ def karatsuba_strs(x, y):
         # Done
         return str(int(ac10n) + int(a_plus_b_x_c_plus_d_rm10m) + int(bd))
 
+def str_to_limbs(x):
+    """ Digits of the string x as base 10^4 limbs, least significant limb
+    first, in an int64 array. Anything but ASCII digits raises ValueError,
+    as int(x) did in the string versions."""
+    if not (x.isascii() and x.isdigit()): # also rejects "", signs and spaces
+        raise ValueError("not a non-negative decimal integer: %r" % x)
+    x = "0" * (-len(x) % DIGITS_PER_LIMB) + x # whole limbs only
+    digits = np.frombuffer(x.encode('ascii'), dtype=np.uint8) - ord('0')
+    weights = 10 ** np.arange(DIGITS_PER_LIMB - 1, -1, -1) # 1000, 100, 10, 1
+    return (digits.reshape(-1, DIGITS_PER_LIMB) @ weights)[::-1].astype(np.int64)
+
+def limbs_to_str(limbs):
+    """ Decimal string of sum(limbs[i] * 10^(4i)). Limbs can be anything
+    karatsuba_limbs leaves behind -- larger than the base or negative --
+    as long as the total is non-negative; carries are propagated here once.
+
+    Each carry_once pass shrinks every carry by a factor of the base, so a
+    few vectorized passes leave all limbs in range; only a long run of
+    9999 (or 0000 with a borrow) that a carry has to ripple through is
+    finished limb by limb, from where it starts."""
+    limbs = np.append(limbs, np.zeros(5, dtype=np.int64)) # 10^20 > any int64 carry
+    for _ in range(32):
+        out_of_range = (limbs[:-1] < 0) | (limbs[:-1] >= LIMB_BASE)
+        if not out_of_range.any():
+            break
+        carry_once(limbs)
+    else: # still rippling: finish from the first limb out of range
+        start = int(np.flatnonzero(out_of_range)[0])
+        top = limbs[start:].tolist()
+        carry = 0
+        for i in range(len(top)):
+            carry, top[i] = divmod(top[i] + carry, LIMB_BASE)
+        limbs[start:] = top
+    significant = np.flatnonzero(limbs)
+    limbs = limbs[:significant[-1] + 1 if len(significant) else 1][::-1] # most significant first
+    weights = 10 ** np.arange(DIGITS_PER_LIMB - 1, -1, -1)
+    digits = (limbs[:, None] // weights % 10).astype(np.uint8) + ord('0')
+    return digits.tobytes().decode('ascii').lstrip("0") or "0" # like str(int(...))
+
+def carry_once(limbs):
+    """ One carry pass in place: every limb is reduced below the base and its
+    carry added to the next one, the top limb is expected to have room. Keeps
+    limbs of a+b and c+d close to the base at every level."""
+    carry = limbs[:-1] // LIMB_BASE
+    limbs[:-1] -= carry * LIMB_BASE
+    limbs[1:] += carry
+
+def add_limbs(*terms):
+    """ Sum of (coefficient, offset, limbs) terms, each worth
+    coefficient * limbs * base^offset, as one limb array long enough for all."""
+    total = np.zeros(max(offset + len(limbs) for _, offset, limbs in terms), dtype=np.int64)
+    for coefficient, offset, limbs in terms:
+        total[offset:offset + len(limbs)] += coefficient * limbs
+    return total
+
+def split_limbs(x, start, stop, size):
+    """ x[start:stop] in a zeroed array of size limbs: parts of the shorter
+    operand can be short or empty, and size leaves room for carries."""
+    part = np.zeros(size, dtype=np.int64)
+    piece = x[start:stop]
+    part[:len(piece)] = piece
+    return part
+
+def karatsuba_split(x, y, multiply):
+    """ One level of Karatsuba: x*y from the three products multiply(a, c),
+    multiply(b, d) and multiply(a+b, c+d) of the halves of x and y."""
+    n = max(len(x), len(y))
+    m = (n + 1) // 2 # low half, the longer one
+    b, a = x[:m], x[m:] # x = a * base^m + b
+    d, c = y[:m], y[m:] # y = c * base^m + d
+
+    ac = multiply(a, c)
+    bd = multiply(b, d)
+    a_plus_b = split_limbs(b, 0, m, m + 1) + split_limbs(a, 0, m, m + 1) # room for the carry out
+    c_plus_d = split_limbs(d, 0, m, m + 1) + split_limbs(c, 0, m, m + 1)
+    carry_once(a_plus_b)
+    carry_once(c_plus_d)
+    ad_plus_bc = add_limbs((1, 0, multiply(a_plus_b, c_plus_d)), (-1, 0, ac), (-1, 0, bd)) # (a+b)(c+d)-ac-bd
+
+    # ac * base^2m + (ad+bc) * base^m + bd, adding limbs at their offsets
+    return add_limbs((1, 0, bd), (1, m, ad_plus_bc), (1, 2 * m, ac))
+
+def unbalanced_split(x, y, multiply):
+    """ x*y for operands of very different lengths: the longer one is cut in
+    chunks as long as the shorter one and the balanced products
+    multiply(chunk, shorter) are added at their offsets, instead of padding
+    the shorter operand with zeros up to the length of the longer one."""
+    if len(x) < len(y):
+        x, y = y, x
+    m = len(y)
+    return add_limbs(*((1, start, multiply(x[start:start + m], y)) for start in range(0, len(x), m)))
+
+def karatsuba_limbs(x, y):
+    """ Karatsuba multiplication on limb arrays.
+
+    Inputs
+    ------
+    x, y : np.ndarray
+      int64 limbs, least significant first, as from str_to_limbs.
+
+    Returns
+    -------
+    np.ndarray
+      int64 limbs of x*y, not normalized: limbs can exceed the base or be
+      negative, only the total sum(limbs[i] * base^i) is the product. Below
+      KARATSUBA_LIMB_CUTOFF limbs this is np.convolve, the schoolbook product
+    """
+    if min(len(x), len(y)) == 0:
+        return np.zeros(1, dtype=np.int64) # a high half beyond the shorter operand
+    if min(len(x), len(y)) <= KARATSUBA_LIMB_CUTOFF:
+        return np.convolve(x, y) # base case: schoolbook in C
+    if max(len(x), len(y)) >= 2 * min(len(x), len(y)):
+        return unbalanced_split(x, y, karatsuba_limbs)
+    return karatsuba_split(x, y, karatsuba_limbs)
+
+def divide_limbs_exact(limbs, divisor):
+    """ limbs / divisor for a total that divisor divides exactly, 2 or 3.
+
+    Limb by limb, what is left over from limb i+1 moves down to limb i as
+    base times itself. Since the base is 0 modulo 2 and 1 modulo 3, the
+    remainder left at each limb is known without a sequential pass: a_i mod 2,
+    or the sum of the limbs from i up, mod 3."""
+    remainder = limbs % divisor
+    if LIMB_BASE % divisor == 1:
+        remainder = np.cumsum(remainder[::-1])[::-1] % divisor
+    moved_down = np.zeros(len(limbs), dtype=np.int64)
+    moved_down[:-1] = remainder[1:] * LIMB_BASE
+    return (limbs - remainder + moved_down) // divisor
+
+def toom3_split(x, y, multiply):
+    """ One level of Toom-3: x and y in three parts are polynomials of degree
+    2 in s = base^k, their product of degree 4 is interpolated from the five
+    products multiply(x(p), y(p)) at p = 0, 1, -1, -2 and infinity, with
+    Bodrato's sequence of exact divisions by 2 and 3."""
+    n = max(len(x), len(y))
+    k = (n + 2) // 3
+    evaluations = []
+    for z in (x, y):
+        z0, z1, z2 = (split_limbs(z, start, start + k, k + 1) for start in (0, k, 2 * k))
+        at_minus_1 = z0 - z1 + z2
+        points = [z0, z0 + z1 + z2, at_minus_1, 2 * (at_minus_1 + z2) - z0, z2] # 0, 1, -1, -2, inf
+        for point in points[1:4]:
+            carry_once(point) # values up to 7 limbs, signed: back to one limb each
+        evaluations.append(points)
+    r0, r1, rm1, rm2, rinf = (multiply(px, py) for px, py in zip(*evaluations))
+
+    r3 = divide_limbs_exact(add_limbs((1, 0, rm2), (-1, 0, r1)), 3)
+    r1 = divide_limbs_exact(add_limbs((1, 0, r1), (-1, 0, rm1)), 2)
+    r2 = add_limbs((1, 0, rm1), (-1, 0, r0))
+    r3 = add_limbs((1, 0, divide_limbs_exact(add_limbs((1, 0, r2), (-1, 0, r3)), 2)), (2, 0, rinf))
+    r2 = add_limbs((1, 0, r2), (1, 0, r1), (-1, 0, rinf))
+    r1 = add_limbs((1, 0, r1), (-1, 0, r3))
+    return add_limbs((1, 0, r0), (1, k, r1), (1, 2 * k, r2), (1, 3 * k, r3), (1, 4 * k, rinf))
+
+def fft_error_bound(x, y, size):
+    """ Largest possible error of a coefficient of the FFT convolution of x
+    and y in float64, with transforms of size points (Percival's bound,
+    taking numpy's roots of unity to be correctly rounded)."""
+    eps = np.finfo(np.float64).eps / 2
+    levels = math.log2(size)
+    relative = math.expm1(3 * levels * math.log1p(eps) + (3 * levels + 1) * math.log1p(eps * math.sqrt(5))
+                          + 3 * levels * math.log1p(eps))
+    return float(np.linalg.norm(x)) * float(np.linalg.norm(y)) * relative
+
+def fft_limbs(x, y):
+    """ Multiplication on limb arrays with numpy's real FFT: O(n log n).
+
+    The limbs are split into base 100 digits and their convolution is
+    computed in float64 and rounded. When fft_error_bound leaves room for the
+    rounding to go wrong (at hundreds of millions of digits) the operands
+    get one Karatsuba split instead, so the product is always exact. Returns
+    limbs that are not normalized, like karatsuba_limbs."""
+    if min(len(x), len(y)) == 0:
+        return np.zeros(1, dtype=np.int64)
+    # limb = high * 100 + low, as two digits, least significant first
+    digits_x = np.stack((x % FFT_DIGIT_BASE, x // FFT_DIGIT_BASE), axis=1).ravel().astype(np.float64)
+    digits_y = np.stack((y % FFT_DIGIT_BASE, y // FFT_DIGIT_BASE), axis=1).ravel().astype(np.float64)
+    length = len(digits_x) + len(digits_y) - 1
+    size = 1 << (length - 1).bit_length() # no wrap-around
+    if fft_error_bound(digits_x, digits_y, size) >= 0.5:
+        return karatsuba_split(x, y, fft_limbs)
+    spectrum = np.fft.rfft(digits_x, size) * np.fft.rfft(digits_y, size)
+    digits = np.rint(np.fft.irfft(spectrum, size)[:length]).astype(np.int64)
+    if length % 2:
+        digits = np.append(digits, 0)
+    return digits[0::2] + digits[1::2] * FFT_DIGIT_BASE # back to limbs
+
+def fft_mult_str(x, y):
+    """ Product of two non-negative integers represented as strings of any
+    length, the same as mult_str, with fft_limbs."""
+    return limbs_to_str(fft_limbs(str_to_limbs(x), str_to_limbs(y)))
+
+def hybrid_limbs(x, y):
+    """ Multiplication on limb arrays with the algorithm suited to each size,
+    at every level of the recursion: np.convolve (schoolbook) up to
+    limb_thresholds['schoolbook'] limbs, Karatsuba up to
+    limb_thresholds['toom3'] and Toom-3 beyond, unless the size is past
+    limb_thresholds['fft'], when fft_limbs takes over. Operands of very
+    different lengths go through unbalanced_split first. Returns limbs that
+    are not normalized, like karatsuba_limbs."""
+    size = min(len(x), len(y))
+    if size == 0:
+        return np.zeros(1, dtype=np.int64)
+    if size <= limb_thresholds['schoolbook']:
+        return np.convolve(x, y) # O(nm), fine for unbalanced operands too
+    if max(len(x), len(y)) >= 2 * size:
+        return unbalanced_split(x, y, hybrid_limbs)
+    if size > limb_thresholds['fft']:
+        return fft_limbs(x, y)
+    if size <= limb_thresholds['toom3']:
+        return karatsuba_split(x, y, hybrid_limbs)
+    return toom3_split(x, y, hybrid_limbs)
+
+def hybrid_mult_str(x, y):
+    """ Product of two non-negative integers represented as strings of any
+    length, the same as mult_str, with hybrid_limbs. The thresholds are
+    calibrated on first use, or read from THRESHOLDS_CACHE."""
+    if not limb_thresholds:
+        load_thresholds()
+    return limbs_to_str(hybrid_limbs(str_to_limbs(x), str_to_limbs(y)))
+
+def best_time(multiply, x, y, repeats=3):
+    """ Shortest of a few runs of multiply(x, y), in seconds."""
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        multiply(x, y)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def calibrate_thresholds(max_limbs=1 << 14):
+    """ Measures where one level of Karatsuba beats np.convolve, then where
+    one level of Toom-3 beats one of Karatsuba, and last where fft_limbs beats
+    the three of them, doubling the operand size up to max_limbs. Each
+    threshold is the largest size where the simpler algorithm was still as
+    fast; max_limbs when the simpler one won at every size measured."""
+    def operands(size):
+        return (np.random.randint(0, LIMB_BASE, size, dtype=np.int64),
+                np.random.randint(0, LIMB_BASE, size, dtype=np.int64))
+
+    thresholds = {'schoolbook': 16, 'toom3': max_limbs, 'fft': max_limbs}
+    limb_thresholds.update(thresholds) # what the recursive calls below use
+    size = 32
+    while size <= max_limbs:
+        x, y = operands(size)
+        if best_time(np.convolve, x, y) <= best_time(lambda x, y: karatsuba_split(x, y, np.convolve), x, y):
+            thresholds['schoolbook'] = size
+        else:
+            break
+        size *= 2
+    limb_thresholds.update(thresholds)
+    size = 2 * thresholds['schoolbook']
+    while size <= max_limbs:
+        x, y = operands(size)
+        karatsuba = best_time(lambda x, y: karatsuba_split(x, y, hybrid_limbs), x, y)
+        if best_time(lambda x, y: toom3_split(x, y, hybrid_limbs), x, y) < karatsuba:
+            thresholds['toom3'] = size // 2
+            break
+        size *= 2
+    limb_thresholds.update(thresholds)
+    size = 16
+    while size <= max_limbs:
+        x, y = operands(size)
+        if best_time(fft_limbs, x, y) < best_time(hybrid_limbs, x, y):
+            thresholds['fft'] = size // 2
+            break
+        size *= 2
+    return thresholds
+
+def load_thresholds(path=THRESHOLDS_CACHE, recalibrate=False):
+    """ Sets limb_thresholds for this host: from the JSON cache at path, or
+    by calibrate_thresholds, saving the result there for the next run. The
+    cache is keyed by host name and limb size; a cache that cannot be
+    written is not an error, the thresholds are just measured again."""
+    key = "%s/%d" % (platform.node(), DIGITS_PER_LIMB)
+    cache = {}
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        pass # no cache yet, or unreadable: calibrate
+    if recalibrate or set(cache.get(key, ())) != {'schoolbook', 'toom3', 'fft'}:
+        cache[key] = calibrate_thresholds()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(cache, f, indent=2)
+        except OSError:
+            pass
+    limb_thresholds.clear()
+    limb_thresholds.update(cache[key])
+    return dict(limb_thresholds)
+
+worker_state = {} # set in every pool worker by init_multiply_worker
+
+def pack_limbs(limbs):
+    """ Limb array as (dtype, bytes) to send to or from a worker: int16 when
+    every limb fits, as for split operands, int64 otherwise. Four times
+    smaller than int64 and far smaller than the pickled digit string."""
+    if len(limbs) == 0 or np.abs(limbs).max() < 1 << 15:
+        return np.dtype(np.int16).str, limbs.astype(np.int16).tobytes()
+    return np.dtype(np.int64).str, limbs.tobytes()
+
+def unpack_limbs(packed):
+    """ int64 limb array back from pack_limbs."""
+    dtype, buffer = packed
+    return np.frombuffer(buffer, dtype=dtype).astype(np.int64)
+
+def init_multiply_worker(thresholds):
+    """ Pool initializer: the workers use the thresholds of the parent,
+    without calibrating again."""
+    limb_thresholds.clear()
+    limb_thresholds.update(thresholds)
+
+def multiply_worker(packed_pair):
+    """ One subproduct with hybrid_limbs, operands and product as pack_limbs."""
+    x, y = (unpack_limbs(packed) for packed in packed_pair)
+    return pack_limbs(hybrid_limbs(x, y))
+
+def karatsuba_levels(x, y, levels, multiply):
+    """ x*y with the top levels of Karatsuba (chunks first for unbalanced
+    operands) and multiply for the 3^levels products left below them."""
+    if levels == 0 or min(len(x), len(y)) < PARALLEL_MIN_LIMBS:
+        return multiply(x, y)
+    if max(len(x), len(y)) >= 2 * min(len(x), len(y)):
+        return unbalanced_split(x, y, lambda a, b: karatsuba_levels(a, b, levels, multiply))
+    return karatsuba_split(x, y, lambda a, b: karatsuba_levels(a, b, levels - 1, multiply))
+
+def parallel_karatsuba_limbs(x, y, workers=None, levels=1):
+    """ Multiplication on limb arrays with the subproducts of the top levels
+    of Karatsuba -- 3 for one level, 9 for two -- computed on a process pool.
+
+    The operands of the subproducts do not depend on their results, so a
+    first pass through karatsuba_levels only collects them. They go to the
+    pool as compact buffers, and a second pass combines the products in the
+    same order. Below PARALLEL_MIN_LIMBS limbs, or with one worker, this is
+    just hybrid_limbs. Returns limbs that are not normalized, like
+    karatsuba_limbs.
+
+    The subproducts themselves go through hybrid_limbs, that is FFT at these
+    sizes, where three half-size products take 1.0-1.35 times one full
+    product (measured from 2^10 to 2^18 limbs). With 3 workers the product
+    can at best be 2.2-3 times faster, about 2 times once the pool overhead
+    is paid, not the 3 times of Karatsuba on schoolbook leaves. In
+    parallel_mult_str the serial limbs_to_str takes about twice as long as
+    the product at 10^6 digits, which bounds the end-to-end gain further.
+    Only measured on a single core so far: the multi-core figures are the
+    expected ones, not benchmarked."""
+    if not limb_thresholds:
+        load_thresholds()
+    if workers == 1 or min(len(x), len(y)) < PARALLEL_MIN_LIMBS:
+        return hybrid_limbs(x, y) # serial fallback
+    pairs = []
+    def collect(a, b): # first pass: the subproducts to compute
+        pairs.append((pack_limbs(a), pack_limbs(b)))
+        return np.zeros(1, dtype=np.int64)
+    karatsuba_levels(x, y, levels, collect)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_multiply_worker,
+                             initargs=(dict(limb_thresholds),)) as pool:
+        products = iter([unpack_limbs(packed) for packed in pool.map(multiply_worker, pairs)])
+    return karatsuba_levels(x, y, levels, lambda a, b: next(products)) # second pass
+
+def parallel_mult_str(x, y, workers=None, levels=1):
+    """ Product of two non-negative integers represented as strings of any
+    length, the same as mult_str, with parallel_karatsuba_limbs."""
+    return limbs_to_str(parallel_karatsuba_limbs(str_to_limbs(x), str_to_limbs(y), workers, levels))
+
 def print_comparison_table():
-    data = {'n': [], 'T(n) plain' : [], 'T(n) Karatsuba' : []}
+    data = {'n': [], 'T(n) plain' : [], 'T(n) Karatsuba' : [], 'T(n) FFT' : []}
 
     for n in range(1, 14):
         x_digits = []
@@ -121,9 +528,14 @@ def print_comparison_table():
         karatsuba_strs(x, y)
         stopTimeK = time.time()
 
+        startTimeF = time.time()
+        fft_mult_str(x, y)
+        stopTimeF = time.time()
+
         data['n'].append(2 ** n)
         data['T(n) plain'].append(stopTimeM - startTimeM)
         data['T(n) Karatsuba'].append(stopTimeK - startTimeK)
+        data['T(n) FFT'].append(stopTimeF - startTimeF)
         
         dataFrame = pd.DataFrame(data)
 
@@ -131,8 +543,8 @@ def print_comparison_table():
 
     
 
-    grph.figure("Plain vs. Karatsuba Multiplication Analysis Chart")
-    grph.title('Plain vs. Karatsuba Multiplication')
+    grph.figure("Plain vs. Karatsuba vs. FFT Multiplication Analysis Chart")
+    grph.title('Plain vs. Karatsuba vs. FFT Multiplication')
 
     grph.xlabel('n')
     grph.ylabel('Time (s)')
@@ -142,12 +554,19 @@ def print_comparison_table():
 
     grph.plot(dataFrame['n'], dataFrame['T(n) plain'], marker='o', label='Plain Integer Multiplication')
     grph.plot(dataFrame['n'], dataFrame['T(n) Karatsuba'], marker='o', label='Karatsuba Multiplication')
+    grph.plot(dataFrame['n'], dataFrame['T(n) FFT'], marker='o', label='FFT Multiplication')
     
     grph.legend()
     grph.show()
 
 
-print_comparison_table()
+if __name__ == "__main__":
+    print_comparison_table()
 
-print(mult_str("12345678", "87654321"))
-print(karatsuba_strs("12345678", "87654321"))
+    print(mult_str("12345678", "87654321"))
+    print(karatsuba_strs_recursive("12345678", "87654321"))
+    print(karatsuba_strs("12345678", "87654321"))
+    print(load_thresholds()) # schoolbook / Karatsuba / Toom-3 cutoffs on this host
+    print(hybrid_mult_str("12345678", "87654321"))
+    print(fft_mult_str("12345678", "87654321"))
+    print(parallel_mult_str("12345678", "87654321")) # small: runs serially